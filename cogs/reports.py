@@ -4,6 +4,67 @@ import datetime
 import json
 import os
 import asyncio
+import bisect
+import collections
+import functools
+import time
+import sqlite3
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    guild_id INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    reported_user INTEGER NOT NULL,
+    reported_by INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    status TEXT NOT NULL,
+    channel_id INTEGER,
+    message_id INTEGER,
+    PRIMARY KEY (guild_id, id)
+);
+CREATE INDEX IF NOT EXISTS reports_status ON reports (guild_id, status);
+"""
+
+_INSERT_REPORT = (
+    "INSERT INTO reports (guild_id, id, reported_user, reported_by, reason, timestamp, status, channel_id, message_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _fmt_ts(iso):
+    """Formatear una fecha ISO para mostrarla (memorizado por cadena)"""
+    return datetime.datetime.fromisoformat(iso).strftime('%d/%m/%Y %H:%M')
+
+
+# Reacciones del mensaje de reporte y del mensaje de acciones de moderación
+_REPORT_EMOJIS = ("✅", "❌", "🔨")
+_MOD_EMOJIS = ("🔇", "👢", "🔨")
+
+# Emojis que el sistema de reportes procesa (reporte y acciones de moderación)
+_ALLOWED_EMOJIS = frozenset(_REPORT_EMOJIS + _MOD_EMOJIS)
+
+_REPORT_ACTIONS_TEXT = (
+    "Reacciona con:\n"
+    "✅ - Marcar reporte como resuelto\n"
+    "❌ - Descartar reporte\n"
+    "🔨 - Mostrar opciones de moderación (silenciar/expulsar/banear)"
+)
+
+_USER_NOT_FOUND_TEXT = "No se pudo encontrar al usuario. Es posible que haya abandonado el servidor."
+
+_MOD_ACTIONS_TEXT = (
+    "Reacciona con:\n"
+    "🔇 - **Silenciar Usuario**\n"
+    "     • Impide que el usuario escriba en los canales\n"
+    "👢 - **Expulsar Usuario**\n"
+    "     • Expulsa al usuario del servidor (puede volver a entrar)\n"
+    "🔨 - **Banear Usuario**\n"
+    "     • Banea permanentemente al usuario del servidor"
+)
+
 
 class Reports(commands.Cog):
     """
@@ -13,26 +74,307 @@ class Reports(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.reports_file = 'data/reports.json'
+        self.reports_db = 'data/reports.db'
+        self.legacy_reports_file = 'data/reports.json'  # Solo se lee para importar reportes antiguos
         self.pending_actions = {}  # Para almacenar acciones pendientes
+        self.pending_action_ttl = 600  # Segundos antes de descartar una acción no completada
+        self.permission_concurrency = 5  # Cambios de permisos simultáneos al crear el rol de silenciado
+        self.member_fetch_concurrency = 5  # Consultas de miembros simultáneas en !reports
+        self._db_lock = asyncio.Lock()  # Una sola escritura a la vez en la conexión
+        # Cachés por servidor: guild_id -> id del canal "reportes" / rol "Silenciado"
+        self._reports_channel = {}
+        self._muted_role = {}
+        # Permisos del canal de reportes para roles de moderación: guild_id -> overwrites
+        self._mod_overwrites_cache = {}
+        # Miembros obtenidos de la API cuando no están en la caché del bot
+        self.member_cache_size = 4096
+        self.member_cache_ttl = 300  # Segundos que se reutiliza un miembro obtenido
+        self._member_cache = collections.OrderedDict()  # (guild_id, user_id) -> (Member, expira)
+        # Ids de todos los canales de reportes, para descartar reacciones ajenas
+        self._report_channel_ids = set()
+        # Índice de mensajes de reporte: message_id -> (server_id, índice, usuario reportado)
+        self._report_index = {}
+        # Mensajes de los canales de reportes ya comprobados que no son reportes
+        self.checked_messages_limit = 4096
+        self._non_report_messages = set()
         self.load_reports()
 
     def load_reports(self):
-        """Cargar reportes existentes o crear archivo si no existe"""
+        """Abrir la base de datos de reportes (creándola si no existe) y cargarlos"""
         if not os.path.exists('data'):
             os.makedirs('data')
-        
-        if os.path.exists(self.reports_file):
-            with open(self.reports_file, 'r') as f:
-                self.reports = json.load(f)
-        else:
-            self.reports = {}
-            self.save_reports()
 
-    def save_reports(self):
-        """Guardar reportes en el archivo"""
-        with open(self.reports_file, 'w') as f:
-            json.dump(self.reports, f, indent=4)
+        self._db = sqlite3.connect(self.reports_db, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        # WAL: escrituras pequeñas y duraderas sin reescribir todo el historial
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.executescript(_SCHEMA)
+        self._import_legacy_json()
+
+        self.reports = self._sync_load()
+        self._build_report_index()
+
+    async def areload(self):
+        """Recargar los reportes de la base de datos sin bloquear el bucle de eventos"""
+        async with self._db_lock:
+            self.reports = await asyncio.to_thread(self._sync_load)
+        self._build_report_index()
+
+    def _import_legacy_json(self):
+        """Importar los reportes del antiguo reports.json si la base de datos está vacía"""
+        if not os.path.exists(self.legacy_reports_file) or os.path.getsize(self.legacy_reports_file) == 0:
+            return
+        if self._db.execute("SELECT 1 FROM reports LIMIT 1").fetchone():
+            return
+
+        # Un archivo vacío o ilegible no debe impedir que el cog arranque
+        try:
+            with open(self.legacy_reports_file, 'r') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo importar {self.legacy_reports_file}: {e}")
+            return
+        if not isinstance(legacy, dict):
+            return
+
+        rows = []
+        for server_id, guild_reports in legacy.items():
+            # Formato antiguo: lista; formato posterior: {"items": [...], ...}
+            items = guild_reports if isinstance(guild_reports, list) else guild_reports["items"]
+            for idx, report in enumerate(items):
+                # Los reportes antiguos se numeraban por su posición
+                rows.append((
+                    int(server_id), report.get("id", idx + 1), report["reported_user"],
+                    report["reported_by"], report["reason"], report["timestamp"],
+                    report["status"], report.get("channel_id"), report.get("message_id")
+                ))
+        with self._db:
+            self._db.executemany(_INSERT_REPORT, rows)
+
+    def _sync_load(self):
+        """Leer todos los reportes de la base de datos"""
+        rows = self._db.execute(
+            "SELECT * FROM reports ORDER BY guild_id, id"
+        ).fetchall()
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(str(row["guild_id"]), []).append(dict(row))
+        return {server_id: self._new_guild_reports(items) for server_id, items in grouped.items()}
+
+    def _sync_execute(self, query, params):
+        """Ejecutar una escritura y confirmarla"""
+        with self._db:
+            self._db.execute(query, params)
+
+    async def _execute(self, query, params):
+        """Ejecutar una escritura sin bloquear el bucle de eventos"""
+        async with self._db_lock:
+            await asyncio.to_thread(self._sync_execute, query, params)
+
+    def _new_guild_reports(self, items=None):
+        """Crear el registro de reportes de un servidor con su índice por estado"""
+        items = items or []
+        by_status = {"pendiente": [], "resuelto": [], "descartado": []}
+        by_id = {}  # id del reporte -> índice en items
+        for idx, report in enumerate(items):
+            by_status.setdefault(report["status"], []).append(idx)
+            by_id[report["id"]] = idx
+        next_id = max(by_id, default=0) + 1
+        return {"items": items, "by_status": by_status, "by_id": by_id, "next_id": next_id}
+
+    async def _set_status(self, server_id, idx, status):
+        """Cambiar el estado de un reporte manteniendo el índice por estado"""
+        guild_reports = self.reports[server_id]
+        report = guild_reports["items"][idx]
+        by_status = guild_reports["by_status"]
+        by_status[report["status"]].remove(idx)
+        bisect.insort(by_status.setdefault(status, []), idx)
+        report["status"] = status
+        await self._execute(
+            "UPDATE reports SET status = ? WHERE guild_id = ? AND id = ?",
+            (status, int(server_id), report["id"])
+        )
+
+    def _remember_non_report(self, message_id):
+        """Recordar un mensaje que no es un reporte para no volver a obtenerlo"""
+        if len(self._non_report_messages) >= self.checked_messages_limit:
+            self._non_report_messages.clear()
+        self._non_report_messages.add(message_id)
+
+    async def _index_legacy_report(self, message, server_id):
+        """Asociar a su reporte un mensaje publicado antes de guardar message_id"""
+        footer = message.embeds[0].footer.text or ""
+        if not footer.startswith("ID del Reporte: "):
+            return None
+        try:
+            report_id = int(footer.split(": ", 1)[1])
+        except ValueError:
+            return None
+
+        guild_reports = self.reports.get(server_id)
+        if not guild_reports:
+            return None
+        idx = guild_reports["by_id"].get(report_id)
+        if idx is None:
+            return None
+        report = guild_reports["items"][idx]
+        if report.get("message_id"):
+            return None
+
+        report["message_id"] = message.id
+        entry = (server_id, idx, report["reported_user"])
+        self._report_index[message.id] = entry
+        await self._execute(
+            "UPDATE reports SET message_id = ? WHERE guild_id = ? AND id = ?",
+            (message.id, int(server_id), report_id)
+        )
+        return entry
+
+    def _build_report_index(self):
+        """Reconstruir el índice de mensajes a partir de los reportes guardados"""
+        self._report_index = {}
+        for server_id, guild_reports in self.reports.items():
+            for idx, report in enumerate(guild_reports["items"]):
+                if report.get("message_id"):
+                    self._report_index[report["message_id"]] = (server_id, idx, report["reported_user"])
+
+    async def cog_unload(self):
+        """Cerrar la base de datos al descargar el cog"""
+        async with self._db_lock:
+            await asyncio.to_thread(self._db.close)
+
+    def _get_reports_channel(self, guild):
+        """Obtener el canal de reportes del servidor usando la caché"""
+        channel_id = self._reports_channel.get(guild.id)
+        if channel_id is not None:
+            channel = guild.get_channel(channel_id)
+            if channel:
+                return channel
+        channel = discord.utils.get(guild.channels, name="reportes")
+        if channel:
+            self._remember_reports_channel(channel)
+        return channel
+
+    def _remember_reports_channel(self, channel):
+        """Registrar un canal de reportes en las cachés"""
+        self._reports_channel[channel.guild.id] = channel.id
+        self._report_channel_ids.add(channel.id)
+
+    def _get_muted_role(self, guild):
+        """Obtener el rol de silenciado del servidor usando la caché"""
+        role_id = self._muted_role.get(guild.id)
+        if role_id is not None:
+            role = guild.get_role(role_id)
+            if role:
+                return role
+        role = discord.utils.get(guild.roles, name="Silenciado")
+        if role:
+            self._muted_role[guild.id] = role.id
+        return role
+
+    async def _get_message(self, channel, message_id):
+        """Obtener un mensaje de la caché del bot o, si no está, de la API"""
+        message = discord.utils.get(self.bot.cached_messages, id=message_id)
+        if message is None:
+            message = await channel.fetch_message(message_id)
+        return message
+
+    async def _resolve_member(self, guild, user_id):
+        """Obtener un miembro de la caché del bot, de la caché local o de la API"""
+        member = guild.get_member(user_id)
+        if member:
+            return member
+
+        # Con la caché de miembros completa, no estar en ella es haber salido del servidor
+        if guild.chunked:
+            return None
+
+        key = (guild.id, user_id)
+        now = time.monotonic()
+        cached = self._member_cache.get(key)
+        if cached:
+            member, expires = cached
+            if expires > now:
+                self._member_cache.move_to_end(key)
+                return member
+            del self._member_cache[key]
+
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.NotFound:
+            # Recordar también que no está, para no repetir la consulta
+            member = None
+        except discord.HTTPException:
+            return None
+
+        self._member_cache[key] = (member, now + self.member_cache_ttl)
+        if len(self._member_cache) > self.member_cache_size:
+            self._member_cache.popitem(last=False)
+        return member
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload):
+        """Olvidar al miembro que abandona el servidor"""
+        self._member_cache.pop((payload.guild_id, payload.user.id), None)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        """Olvidar que el miembro no estaba en el servidor"""
+        self._member_cache.pop((member.guild.id, member.id), None)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        """Registrar los canales de reportes existentes al conectar"""
+        for guild in self.bot.guilds:
+            self._get_reports_channel(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        """Registrar el canal de reportes de un servidor al que se une el bot"""
+        self._get_reports_channel(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        """Olvidar el canal de reportes si se elimina"""
+        self._report_channel_ids.discard(channel.id)
+        if self._reports_channel.get(channel.guild.id) == channel.id:
+            del self._reports_channel[channel.guild.id]
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        """Olvidar el rol de silenciado si se elimina"""
+        if self._muted_role.get(role.guild.id) == role.id:
+            del self._muted_role[role.guild.id]
+        self._mod_overwrites_cache.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        """Invalidar los permisos de moderación calculados del servidor"""
+        self._mod_overwrites_cache.pop(role.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        """Invalidar los permisos de moderación calculados del servidor"""
+        self._mod_overwrites_cache.pop(after.guild.id, None)
+
+    def _compute_mod_overwrites(self, guild):
+        """Calcular (y memorizar) los permisos del canal de reportes"""
+        overwrites = self._mod_overwrites_cache.get(guild.id)
+        if overwrites is None:
+            overwrites = {
+                guild.default_role: discord.PermissionOverwrite(read_messages=False),
+                guild.me: discord.PermissionOverwrite(read_messages=True)
+            }
+
+            # Dar acceso a roles con permiso de moderación
+            for role in guild.roles:
+                if role.permissions.manage_messages:
+                    overwrites[role] = discord.PermissionOverwrite(read_messages=True)
+            self._mod_overwrites_cache[guild.id] = overwrites
+        # Copia para que quien la use no altere la caché
+        return dict(overwrites)
 
     @commands.command(
         name="report",
@@ -90,10 +432,23 @@ class Reports(commands.Cog):
             # Guardar reporte
             server_id = str(ctx.guild.id)
             if server_id not in self.reports:
-                self.reports[server_id] = []
+                self.reports[server_id] = self._new_guild_reports()
             
-            self.reports[server_id].append(report_data)
-            self.save_reports()
+            guild_reports = self.reports[server_id]
+            # Reservar el id antes de esperar, para que dos reportes no lo compartan
+            report_id = guild_reports["next_id"]
+            guild_reports["next_id"] += 1
+            report_data["id"] = report_id
+            await self._execute(_INSERT_REPORT, (
+                ctx.guild.id, report_id, member.id, ctx.author.id, reason,
+                report_data["timestamp"], "pendiente", ctx.channel.id, None
+            ))
+
+            # Solo se añade a memoria cuando ya está guardado
+            report_idx = len(guild_reports["items"])
+            guild_reports["items"].append(report_data)
+            guild_reports["by_status"]["pendiente"].append(report_idx)
+            guild_reports["by_id"][report_id] = report_idx
 
             # Enviar confirmación al usuario
             try:
@@ -104,7 +459,7 @@ class Reports(commands.Cog):
             await ctx.send(f"{ctx.author.mention}, tu reporte ha sido enviado y será revisado por el equipo de moderación.", delete_after=10)
 
             # Buscar o crear canal de reportes
-            reports_channel = discord.utils.get(ctx.guild.channels, name="reportes")
+            reports_channel = self._get_reports_channel(ctx.guild)
             if not reports_channel:
                 try:
                     # Crear categoría si no existe
@@ -113,15 +468,7 @@ class Reports(commands.Cog):
                         category = await ctx.guild.create_category("Moderación")
 
                     # Crear canal de reportes con permisos restringidos
-                    overwrites = {
-                        ctx.guild.default_role: discord.PermissionOverwrite(read_messages=False),
-                        ctx.guild.me: discord.PermissionOverwrite(read_messages=True)
-                    }
-                    
-                    # Dar acceso a roles con permiso de moderación
-                    for role in ctx.guild.roles:
-                        if role.permissions.manage_messages:
-                            overwrites[role] = discord.PermissionOverwrite(read_messages=True)
+                    overwrites = self._compute_mod_overwrites(ctx.guild)
 
                     reports_channel = await ctx.guild.create_text_channel(
                         'reportes',
@@ -129,6 +476,7 @@ class Reports(commands.Cog):
                         overwrites=overwrites,
                         topic="Canal para reportes de usuarios"
                     )
+                    self._remember_reports_channel(reports_channel)
                 except Exception as e:
                     await ctx.send(f"No se pudo crear el canal de reportes: {e}", delete_after=10)
                     return
@@ -149,22 +497,21 @@ class Reports(commands.Cog):
             # Añadir explicación de las reacciones
             embed.add_field(
                 name="Acciones Disponibles",
-                value=(
-                    "Reacciona con:\n"
-                    "✅ - Marcar reporte como resuelto\n"
-                    "❌ - Descartar reporte\n"
-                    "🔨 - Mostrar opciones de moderación (silenciar/expulsar/banear)"
-                ),
+                value=_REPORT_ACTIONS_TEXT,
                 inline=False
             )
             
-            embed.set_footer(text=f"ID del Reporte: {len(self.reports[server_id])}")
+            embed.set_footer(text=f"ID del Reporte: {report_id}")
 
             # Añadir botones de acción
             report_msg = await reports_channel.send(embed=embed)
-            await report_msg.add_reaction("✅")
-            await report_msg.add_reaction("❌")
-            await report_msg.add_reaction("🔨")
+            report_data["message_id"] = report_msg.id
+            self._report_index[report_msg.id] = (server_id, report_idx, member.id)
+            await self._execute(
+                "UPDATE reports SET message_id = ? WHERE guild_id = ? AND id = ?",
+                (report_msg.id, ctx.guild.id, report_id)
+            )
+            await asyncio.gather(*[report_msg.add_reaction(e) for e in _REPORT_EMOJIS])
             
         except Exception as e:
             await ctx.send(f"Error al procesar el reporte: {e}", delete_after=10)
@@ -190,18 +537,33 @@ class Reports(commands.Cog):
         !flex reports todos
         """
         server_id = str(ctx.guild.id)
-        if server_id not in self.reports or not self.reports[server_id]:
+        if server_id not in self.reports or not self.reports[server_id]["items"]:
             await ctx.send("No hay reportes registrados en este servidor.")
             return
 
-        reports_list = self.reports[server_id]
-        if status != "todos":
-            reports_list = [r for r in reports_list if r["status"] == status]
+        # Mostrar solo los últimos 10 reportes
+        items = self.reports[server_id]["items"]
+        if status == "todos":
+            reports_list = items[-10:]
+        else:
+            by_status = self.reports[server_id]["by_status"]
+            reports_list = [items[idx] for idx in by_status.get(status, [])[-10:]]
 
         if not reports_list:
             await ctx.send(f"No hay reportes {status}s.")
             return
 
+        # Resolver a la vez todos los usuarios implicados, una vez por usuario
+        user_ids = list({uid for r in reports_list for uid in (r["reported_user"], r["reported_by"])})
+        sem = asyncio.Semaphore(self.member_fetch_concurrency)
+
+        async def _resolve(uid):
+            async with sem:
+                return await self._resolve_member(ctx.guild, uid)
+
+        resolved = await asyncio.gather(*[_resolve(uid) for uid in user_ids])
+        members = dict(zip(user_ids, resolved))
+
         # Crear embed con la lista de reportes
         embed = discord.Embed(
             title=f"Reportes {status.title()}s",
@@ -209,10 +571,10 @@ class Reports(commands.Cog):
             timestamp=datetime.datetime.utcnow()
         )
 
-        for i, report in enumerate(reports_list[-10:], 1):  # Mostrar solo los últimos 10 reportes
-            reported_user = ctx.guild.get_member(report["reported_user"])
-            reporter = ctx.guild.get_member(report["reported_by"])
-            
+        for i, report in enumerate(reports_list, 1):
+            reported_user = members[report["reported_user"]]
+            reporter = members[report["reported_by"]]
+
             if reported_user and reporter:
                 embed.add_field(
                     name=f"Reporte #{i}",
@@ -220,7 +582,7 @@ class Reports(commands.Cog):
                           f"**Reportado por:** {reporter.mention}\n"
                           f"**Razón:** {report['reason']}\n"
                           f"**Estado:** {report['status']}\n"
-                          f"**Fecha:** {datetime.datetime.fromisoformat(report['timestamp']).strftime('%d/%m/%Y %H:%M')}",
+                          f"**Fecha:** {_fmt_ts(report['timestamp'])}",
                     inline=False
                 )
 
@@ -229,46 +591,60 @@ class Reports(commands.Cog):
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
         """Manejar reacciones en los reportes"""
-        if payload.member.bot:
+        # Descartar cuanto antes emojis ajenos y reacciones fuera de servidores
+        emoji = str(payload.emoji)
+        if emoji not in _ALLOWED_EMOJIS:
+            return
+
+        if payload.guild_id is None:
             return
 
         # Verificar si es un canal de reportes
+        if payload.channel_id not in self._report_channel_ids:
+            return
+
+        if payload.member.bot:
+            return
+
         channel = self.bot.get_channel(payload.channel_id)
-        if not channel or channel.name != "reportes":
+        if not channel:
             return
 
         # Verificar si el usuario tiene permisos
         if not payload.member.guild_permissions.manage_messages:
             return
 
-        message = await channel.fetch_message(payload.message_id)
-        if not message.embeds:
-            return
-
-        emoji = str(payload.emoji)
-        
         # Verificar si es una acción de moderación pendiente
-        if message.id in self.pending_actions:
+        if payload.message_id in self.pending_actions:
+            message = await self._get_message(channel, payload.message_id)
             await self.handle_mod_action(emoji, message, payload.member, channel)
             return
 
-        if emoji not in ["✅", "❌", "🔨"]:
+        if emoji not in _REPORT_EMOJIS:
             return
 
-        # Obtener ID del reporte del footer
-        report_id = int(message.embeds[0].footer.text.split(": ")[1]) - 1
-        server_id = str(payload.guild_id)
-        
-        if server_id not in self.reports or report_id >= len(self.reports[server_id]):
+        # Obtener el reporte asociado al mensaje
+        entry = self._report_index.get(payload.message_id)
+        if entry is None and payload.message_id in self._non_report_messages:
+            return
+
+        message = await self._get_message(channel, payload.message_id)
+        if not message.embeds:
+            self._remember_non_report(payload.message_id)
             return
 
-        report = self.reports[server_id][report_id]
-        reported_user_id = report["reported_user"]
-        reported_user = payload.member.guild.get_member(reported_user_id)
+        if entry is None:
+            # Reportes anteriores al índice: recuperar su id del footer una sola vez
+            entry = await self._index_legacy_report(message, str(payload.guild_id))
+            if entry is None:
+                self._remember_non_report(payload.message_id)
+                return
+
+        server_id, report_idx, reported_user_id = entry
 
         # Procesar acción según la reacción
         if emoji == "✅":  # Marcar como resuelto
-            report["status"] = "resuelto"
+            await self._set_status(server_id, report_idx, "resuelto")
             await message.clear_reactions()
             embed = message.embeds[0]
             embed.color = discord.Color.green()
@@ -277,7 +653,7 @@ class Reports(commands.Cog):
             await message.edit(embed=embed)
             
         elif emoji == "❌":  # Descartar reporte
-            report["status"] = "descartado"
+            await self._set_status(server_id, report_idx, "descartado")
             await message.clear_reactions()
             embed = message.embeds[0]
             embed.color = discord.Color.red()
@@ -285,40 +661,58 @@ class Reports(commands.Cog):
             embed.add_field(name="Descartado por", value=f"{payload.member.mention}", inline=False)
             await message.edit(embed=embed)
             
-        elif emoji == "🔨" and reported_user:  # Mostrar opciones de moderación
+        elif emoji == "🔨":  # Mostrar opciones de moderación
+            # El menú solo necesita el id: silenciar resuelve el miembro más tarde
             action_embed = discord.Embed(
                 title="Acciones de Moderación",
-                description=f"Selecciona una acción para {reported_user.mention}:",
+                description=f"Selecciona una acción para <@{reported_user_id}>:",
                 color=discord.Color.blue()
             )
             
             action_embed.add_field(
                 name="Acciones Disponibles",
-                value=(
-                    "Reacciona con:\n"
-                    "🔇 - **Silenciar Usuario**\n"
-                    "     • Impide que el usuario escriba en los canales\n"
-                    "👢 - **Expulsar Usuario**\n"
-                    "     • Expulsa al usuario del servidor (puede volver a entrar)\n"
-                    "🔨 - **Banear Usuario**\n"
-                    "     • Banea permanentemente al usuario del servidor"
-                ),
+                value=_MOD_ACTIONS_TEXT,
                 inline=False
             )
             
-            action_embed.set_footer(text=f"Usuario: {reported_user.id}")
+            action_embed.set_footer(text=f"Usuario: {reported_user_id}")
             
             action_msg = await channel.send(embed=action_embed)
-            self.pending_actions[action_msg.id] = reported_user.id
-            await action_msg.add_reaction("🔇")
-            await action_msg.add_reaction("👢")
-            await action_msg.add_reaction("🔨")
+            self.pending_actions[action_msg.id] = reported_user_id
+            # Descartar la acción si nadie la completa, para no acumular entradas
+            asyncio.get_running_loop().call_later(
+                self.pending_action_ttl, self.pending_actions.pop, action_msg.id, None
+            )
+            await asyncio.gather(*[action_msg.add_reaction(e) for e in _MOD_EMOJIS])
 
-        self.save_reports()
+    async def _apply_muted_permissions(self, guild, muted_role):
+        """
+        Denegar escribir y reaccionar al rol de silenciado en los canales de texto y voz.
+        Devuelve los canales en los que no se pudo configurar el permiso.
+        """
+        sem = asyncio.Semaphore(self.permission_concurrency)
+
+        async def _apply(ch):
+            async with sem:
+                await ch.set_permissions(muted_role, send_messages=False, add_reactions=False)
+
+        # Las categorías no se tocan: sus canales ya reciben el permiso directamente
+        targets = [
+            ch for ch in guild.channels
+            if isinstance(ch, (discord.TextChannel, discord.VoiceChannel))
+        ]
+        # Un canal sin permisos no debe cancelar la configuración del resto
+        results = await asyncio.gather(*[_apply(ch) for ch in targets], return_exceptions=True)
+        failed = []
+        for ch, result in zip(targets, results):
+            if isinstance(result, Exception):
+                print(f"No se pudo configurar el rol de silenciado en #{ch.name}: {result}")
+                failed.append(ch)
+        return failed
 
     async def handle_mod_action(self, emoji, message, moderator, channel):
         """Manejar las acciones de moderación"""
-        if emoji not in ["🔇", "👢", "🔨"]:
+        if emoji not in _MOD_EMOJIS:
             return
 
         user_id = self.pending_actions.get(message.id)
@@ -326,10 +720,16 @@ class Reports(commands.Cog):
             return
 
         guild = channel.guild
-        target_user = guild.get_member(user_id)
-        if not target_user:
-            await channel.send("No se pudo encontrar al usuario. Es posible que haya abandonado el servidor.")
-            return
+
+        # Solo silenciar necesita el miembro; expulsar y banear bastan con el id.
+        # Se comprueba antes de pedir la razón para no hacerla escribir en balde
+        target_user = None
+        if emoji == "🔇":
+            target_user = await self._resolve_member(guild, user_id)
+            if not target_user:
+                await channel.send(_USER_NOT_FOUND_TEXT)
+                self.pending_actions.pop(message.id, None)
+                return
 
         # Preguntar por la razón
         await channel.send(f"{moderator.mention} Por favor, escribe la razón para esta acción (tienes 30 segundos):")
@@ -343,44 +743,53 @@ class Reports(commands.Cog):
             reason = reason_msg.content
         except asyncio.TimeoutError:
             await channel.send("Tiempo agotado. Acción cancelada.")
-            del self.pending_actions[message.id]
+            self.pending_actions.pop(message.id, None)
             return
 
         # Ejecutar acción correspondiente
         try:
             if emoji == "🔇":  # Silenciar
                 # Buscar o crear rol de silenciado
-                muted_role = discord.utils.get(guild.roles, name="Silenciado")
+                muted_role = self._get_muted_role(guild)
                 if not muted_role:
                     # Crear rol si no existe
                     muted_role = await guild.create_role(name="Silenciado", reason="Rol para silenciar usuarios")
+                    self._muted_role[guild.id] = muted_role.id
                     
-                    # Configurar permisos en todos los canales de texto
-                    for channel in guild.channels:
-                        if isinstance(channel, discord.TextChannel):
-                            await channel.set_permissions(muted_role, send_messages=False)
+                    # Configurar permisos en los canales de texto y voz
+                    failed = await self._apply_muted_permissions(guild, muted_role)
+                    if failed:
+                        await channel.send(
+                            "⚠️ No se pudo configurar el rol de silenciado en: "
+                            + ", ".join(ch.mention for ch in failed)
+                        )
                 
                 # Aplicar rol
                 await target_user.add_roles(muted_role, reason=reason)
                 action_type = "silenciado"
                 
             elif emoji == "👢":  # Expulsar
-                await guild.kick(target_user, reason=reason)
+                try:
+                    await guild.kick(discord.Object(id=user_id), reason=reason)
+                except discord.NotFound:
+                    await channel.send(_USER_NOT_FOUND_TEXT)
+                    self.pending_actions.pop(message.id, None)
+                    return
                 action_type = "expulsado"
                 
             elif emoji == "🔨":  # Banear
-                await guild.ban(target_user, reason=reason, delete_message_days=1)
+                await guild.ban(discord.Object(id=user_id), reason=reason, delete_message_days=1)
                 action_type = "baneado"
             
             # Registrar acción
             log_embed = discord.Embed(
                 title=f"Usuario {action_type}",
-                description=f"{target_user.mention} ha sido {action_type} del servidor.",
+                description=f"<@{user_id}> ha sido {action_type} del servidor.",
                 color=discord.Color.red(),
                 timestamp=datetime.datetime.utcnow()
             )
             
-            log_embed.add_field(name="Usuario", value=f"{target_user} ({target_user.id})", inline=False)
+            log_embed.add_field(name="Usuario", value=f"<@{user_id}> ({user_id})", inline=False)
             log_embed.add_field(name="Moderador", value=f"{moderator.mention}", inline=False)
             log_embed.add_field(name="Razón", value=reason, inline=False)
             
@@ -390,7 +799,7 @@ class Reports(commands.Cog):
             await channel.send(f"Error al ejecutar la acción: {e}")
         
         # Limpiar acción pendiente
-        del self.pending_actions[message.id]
+        self.pending_actions.pop(message.id, None)
 
 async def setup(bot):
     await bot.add_cog(Reports(bot)) 
\ No newline at end of file